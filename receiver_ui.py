@@ -1,37 +1,266 @@
 import socket
 import json
+import sys
+import errno
+import ctypes
 import pygame
 import math
 import time
-from collections import deque
-from dataclasses import dataclass
+import queue
+import threading
+from array import array
+from bisect import bisect_right, insort
+from collections import OrderedDict
+
+try:
+    import orjson  # optional: faster JSON parsing straight from bytes
+except ImportError:
+    orjson = None
 
 
 def wrap360(deg: float) -> float:
     return deg % 360.0
 
 
+# JSON <-> UTF-8 bytes; orjson when installed, stdlib json otherwise
+if orjson is not None:
+    loads_bytes = orjson.loads
+    dumps_bytes = orjson.dumps
+else:
+    def loads_bytes(data):
+        return json.loads(str(data, "utf-8", errors="replace"))
+
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Datagrams without this token cannot be EntityState telemetry and are dropped
+# before parsing; the quoted value matches with or without a space after ':'
+ENTITY_STATE_TOKEN = b'"EntityState"'
+
+# Track colors indexed by int(stale): (fresh, stale)
+DOT_COLORS = ((0, 255, 0), (255, 60, 60))
+VEC_COLORS = ((255, 255, 0), (255, 210, 0))
+TRAIL_COLORS = ((0, 255, 0), (255, 80, 80))
+
+# Heading vector (vx, vy) on screen, 16 px long, at 0.5° resolution (index = int(heading * 2))
+HEADING_VEC_LEN = 16
+_HEADING_VEC = tuple(
+    (math.sin(math.radians(i * 0.5)) * HEADING_VEC_LEN, -math.cos(math.radians(i * 0.5)) * HEADING_VEC_LEN)
+    for i in range(720)
+)
+
+
+# Small pre-drawn dot sprites keyed by (color, radius); lets trails be batched into one blits call
+_dot_cache = {}
+_DOT_KEY = (255, 0, 255)
+
+
+def dot_surface(color, radius):
+    key = (color, radius)
+    surf = _dot_cache.get(key)
+    if surf is None:
+        size = radius * 2 + 1
+        surf = pygame.Surface((size, size))
+        surf.fill(_DOT_KEY)
+        surf.set_colorkey(_DOT_KEY)
+        pygame.draw.circle(surf, color, (radius, radius), radius)
+        _dot_cache[key] = surf
+    return surf
+
+
+# Batched sprite blit, bound once: pygame-ce's fblits when present, classic blits otherwise
+if hasattr(pygame.Surface, "fblits"):
+    def blit_batch(surface, seq):
+        surface.fblits(seq)
+else:
+    def blit_batch(surface, seq):
+        surface.blits(seq, doreturn=False)
+
+
+# Trail gradients keyed by (base color, point count): n dot sprites, dimmest first
+_trail_cache = {}
+
+
+def trail_sprites(base, n):
+    key = (base, n)
+    sprites = _trail_cache.get(key)
+    if sprites is None:
+        base_r, base_g, base_b = base
+        inv = 1.0 / max(1, n - 1)
+        sprites = tuple(
+            dot_surface((int(base_r * i * inv), int(base_g * i * inv), int(base_b * i * inv)), 2)
+            for i in range(n)
+        )
+        _trail_cache[key] = sprites
+    return sprites
+
+
+# Rendered text keyed by (font, text, color); least recently used entry evicted once full
+_text_cache = OrderedDict()
+_TEXT_CACHE_MAX = 512
+
+
+def text_surface(font, text, color):
+    key = (font, text, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        if len(_text_cache) >= _TEXT_CACHE_MAX:
+            _text_cache.popitem(last=False)
+        surf = font.render(text, True, color)
+        _text_cache[key] = surf
+    else:
+        _text_cache.move_to_end(key)
+    return surf
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class RecvMmsgBatch:
+    """
+    Linux recvmmsg(2) via ctypes: one syscall fills up to `count` datagrams
+    into a preallocated slab (one `size`-byte slot per datagram).
+    """
+
+    MSG_DONTWAIT = 0x40
+
+    def __init__(self, fd: int, count=64, size=8192):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._recvmmsg = libc.recvmmsg
+        self._recvmmsg.argtypes = [
+            ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p,
+        ]
+        self._recvmmsg.restype = ctypes.c_int
+
+        self.fd = fd
+        self.count = count
+        self.size = size
+
+        self._buf = bytearray(count * size)
+        self._slab = (ctypes.c_char * (count * size)).from_buffer(self._buf)
+        self._view = memoryview(self._buf)
+        self._iovecs = (_IoVec * count)()
+        self._msgs = (_MMsgHdr * count)()
+
+        base = ctypes.addressof(self._slab)
+        for i in range(count):
+            self._iovecs[i].iov_base = base + i * size
+            self._iovecs[i].iov_len = size
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+
+    def recv(self, vlen: int):
+        """
+        Returns the number of datagrams received (0 if none are waiting).
+        Payload i is valid via payload(i) until the next recv().
+        """
+        n = self._recvmmsg(self.fd, self._msgs, min(vlen, self.count), self.MSG_DONTWAIT, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return 0
+            raise OSError(err, "recvmmsg failed")
+        return n
+
+    def payload(self, i: int):
+        start = i * self.size
+        return self._view[start:start + self._msgs[i].msg_len]
+
+    def contains(self, i: int, token: bytes) -> bool:
+        start = i * self.size
+        return self._buf.find(token, start, start + self._msgs[i].msg_len) >= 0
+
+
 class UdpReceiver:
     def __init__(self, listen_ip="0.0.0.0", listen_port=30001):
         self.addr = (listen_ip, listen_port)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
         self.sock.bind(self.addr)
         self.sock.setblocking(False)
 
+        # Bigger kernel buffer so bursts survive a slow frame; the kernel may cap it
+        # (Linux: net.core.rmem_max), so keep what was actually granted
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        except OSError:
+            pass
+        self.rcvbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+        # Reused receive buffer (no per-datagram bytes allocation)
+        self._buf = bytearray(8192)
+        self._view = memoryview(self._buf)
+
+        # Linux: drain many datagrams per syscall; elsewhere use the recvfrom_into loop
+        self._mmsg = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._mmsg = RecvMmsgBatch(self.sock.fileno())
+            except (OSError, AttributeError):
+                self._mmsg = None
+
     def poll_messages(self, max_per_frame=200):
+        if self._mmsg is not None:
+            try:
+                return self._poll_mmsg(max_per_frame)
+            except OSError as e:
+                if e.errno != errno.ENOSYS:
+                    raise
+                self._mmsg = None  # kernel without recvmmsg: fall back for good
+
         msgs = []
         for _ in range(max_per_frame):
             try:
-                data, _ = self.sock.recvfrom(8192)
+                nbytes, _ = self.sock.recvfrom_into(self._buf, 8192)
             except BlockingIOError:
                 break
+            if self._buf.find(ENTITY_STATE_TOKEN, 0, nbytes) < 0:
+                continue
             try:
-                msg = json.loads(data.decode("utf-8", errors="replace"))
+                msg = loads_bytes(self._view[:nbytes])
                 msgs.append(msg)
             except Exception:
                 pass
         return msgs
 
+    def _poll_mmsg(self, max_per_frame):
+        msgs = []
+        batch = self._mmsg
+        remaining = max_per_frame
+        while remaining > 0:
+            want = min(remaining, batch.count)
+            n = batch.recv(want)
+            for i in range(n):
+                if not batch.contains(i, ENTITY_STATE_TOKEN):
+                    continue
+                try:
+                    msgs.append(loads_bytes(batch.payload(i)))
+                except Exception:
+                    pass
+            remaining -= n
+            if n < want:
+                break
+        return msgs
+
     def close(self):
         try:
             self.sock.close()
@@ -40,6 +269,11 @@ class UdpReceiver:
 
 
 class TrackState:
+    __slots__ = (
+        "entity_id", "entity_type", "x", "y", "heading", "speed", "status", "seq", "last_rx_time",
+        "history_len", "hist_x", "hist_y", "hist_head", "hist_count",
+    )
+
     def __init__(self, history_len=25):
         self.entity_id = None
         self.entity_type = ""
@@ -50,115 +284,249 @@ class TrackState:
         self.status = "NO_DATA"
         self.seq = 0
         self.last_rx_time = 0.0
-        self.history = deque(maxlen=history_len)
 
-    def update_from_msg(self, msg: dict, rx_time: float):
-        self.entity_id = msg.get("entity_id", self.entity_id)
-        self.entity_type = msg.get("entity_type", self.entity_type)
+        # Trail ring buffer: parallel x/y arrays, oldest sample at hist_head once full
+        self.history_len = history_len
+        self.hist_x = array("d", bytes(8 * history_len))
+        self.hist_y = array("d", bytes(8 * history_len))
+        self.hist_head = 0
+        self.hist_count = 0
 
-        self.x = float(msg.get("x", self.x))
-        self.y = float(msg.get("y", self.y))
-        self.heading = wrap360(float(msg.get("heading_deg", self.heading)))
-        self.speed = float(msg.get("speed", self.speed))
-        self.status = str(msg.get("status", self.status))
-        self.seq = int(msg.get("seq", self.seq))
+    def update_from_msg(self, msg: dict, rx_time: float):
+        try:
+            # Common case: complete EntityState from the sender, read by direct indexing
+            entity_id, entity_type = msg["entity_id"], msg["entity_type"]
+            x, y = msg["x"], msg["y"]
+            heading, speed = msg["heading_deg"], msg["speed"]
+            status, seq = msg["status"], msg["seq"]
+        except KeyError:
+            # Partial message: keep current values for missing fields
+            get = msg.get
+            entity_id = get("entity_id", self.entity_id)
+            entity_type = get("entity_type", self.entity_type)
+            x, y = get("x", self.x), get("y", self.y)
+            heading, speed = get("heading_deg", self.heading), get("speed", self.speed)
+            status, seq = get("status", self.status), get("seq", self.seq)
+
+        self.entity_id = entity_id
+        self.entity_type = entity_type
+
+        self.x = float(x)
+        self.y = float(y)
+        # Sender already normalizes to [0, 360); only wrap when it didn't
+        if type(heading) is float and 0.0 <= heading < 360.0:
+            self.heading = heading
+        else:
+            self.heading = wrap360(float(heading))
+        self.speed = float(speed)
+        self.status = str(status)
+        self.seq = int(seq)
 
         self.last_rx_time = rx_time
-        self.history.append((int(self.x), int(self.y)))
-
 
-@dataclass
-class ReplayItem:
-    t: float
-    msg: dict
+        head = self.hist_head
+        self.hist_x[head] = self.x
+        self.hist_y[head] = self.y
+        self.hist_head = (head + 1) % self.history_len
+        if self.hist_count < self.history_len:
+            self.hist_count += 1
 
 
 class Recorder:
-    def __init__(self):
+    """
+    Writes received messages to a JSONL capture.
+
+    write_batch() enqueues one frame's messages as a single item; a daemon
+    thread does the JSON encoding and file I/O, flushing at most every
+    flush_interval seconds. If the writer falls behind by more than
+    max_queue frames, messages are dropped (counted in `dropped`) rather
+    than stalling the render loop. A writer error (e.g. disk full) stops the
+    recording and is kept in `error`.
+    """
+
+    def __init__(self, flush_interval=0.1, batch_size=256, max_queue=600):
         self.enabled = False
-        self.file = None
-
-    def start(self, path: str):
-        self.file = open(path, "w", encoding="utf-8")
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.dropped = 0
+        self.error = None
+        self._queue = None
+        self._thread = None
+        self._stop = None
+
+    def start(self, path: str) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            # Previous capture is still flushing; don't reopen the file under it
+            print("[receiver] Previous recording still being written; try again")
+            return False
+        try:
+            f = open(path, "wb")
+        except OSError as e:
+            self.error = e
+            print(f"[receiver] Cannot record to {path}: {e}")
+            return False
+        self.dropped = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._writer_loop, args=(self._queue, self._stop, f), daemon=True
+        )
+        self._thread.start()
         self.enabled = True
+        return True
 
     def stop(self):
         self.enabled = False
-        if self.file:
-            self.file.close()
-        self.file = None
-
-    def write(self, msg: dict):
-        if not self.enabled or not self.file:
+        if self._thread is None:
+            return
+        if self._thread.is_alive():
+            # The event is the stop signal (drain, flush, close); the sentinel only wakes
+            # the writer early and may not fit if the queue is full
+            self._stop.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=1.0)
+        # A writer that outlived the join is kept so start() can refuse until it exits
+        if not self._thread.is_alive():
+            self._queue = None
+            self._thread = None
+            self._stop = None
+
+    def write_batch(self, msgs: list, rx_wall: float):
+        if not self.enabled or not msgs:
             return
-        out = dict(msg)
-        out["_rx_time"] = time.time()
-        self.file.write(json.dumps(out) + "\n")
-        self.file.flush()
+        try:
+            self._queue.put_nowait((msgs, rx_wall))
+        except queue.Full:
+            self.dropped += len(msgs)
+
+    @staticmethod
+    def _encode_line(msg, rx_wall):
+        # Splice _rx_time into the serialized object rather than copying the dict
+        try:
+            data = dumps_bytes(msg)
+        except (TypeError, ValueError):
+            return None  # unencodable (e.g. nested past orjson's limit); skip just this one
+        if data[-1:] != b"}":
+            return None  # not a JSON object; nothing sensible to record
+        rx = repr(rx_wall).encode()
+        if data == b"{}":
+            return b'{"_rx_time":' + rx + b"}\n"
+        return data[:-1] + b',"_rx_time":' + rx + b"}\n"
+
+    def _writer_loop(self, q, stop, f):
+        last_flush = time.monotonic()
+        done = False
+        try:
+            while not done:
+                lines = []
+                try:
+                    item = q.get(timeout=self.flush_interval)
+                    while True:
+                        if item is None:
+                            done = True
+                            break
+                        msgs, rx_wall = item
+                        for msg in msgs:
+                            line = self._encode_line(msg, rx_wall)
+                            if line is not None:
+                                lines.append(line)
+                        if len(lines) >= self.batch_size:
+                            break
+                        item = q.get_nowait()
+                except queue.Empty:
+                    # Queue drained: finish once stop() has been called
+                    done = stop.is_set()
+
+                if lines:
+                    f.write(b"".join(lines))
+
+                now = time.monotonic()
+                if done or (now - last_flush) >= self.flush_interval:
+                    f.flush()
+                    last_flush = now
+        except Exception as e:
+            # Disk errors (OSError) or anything unexpected: stop visibly rather than
+            # leaving the HUD at ON while write_batch fills a queue nobody drains
+            self.error = e
+            self.enabled = False
+            print(f"[receiver] Recording stopped: {e!r}")
+        finally:
+            try:
+                f.close()
+            except OSError:
+                pass
 
 
 class Replayer:
     def __init__(self):
         self.enabled = False
-        self.items = []
+        # Capture held as parallel columns: relative rx times (sorted) + messages
+        self.times = array("d")
+        self.msgs = []
         self.index = 0
-        self.replay_start_wall = None
+        self.replay_start = None
 
     def load(self, path: str):
-        self.items.clear()
+        self.times = array("d")
+        self.msgs = []
         self.index = 0
         self.enabled = False
-        self.replay_start_wall = None
+        self.replay_start = None
 
-        with open(path, "r", encoding="utf-8") as f:
-            lines = [line.strip() for line in f if line.strip()]
-
-        parsed = []
-        for line in lines:
-            try:
-                msg = json.loads(line)
-                rx_t = float(msg.get("_rx_time", 0.0))
-                msg.pop("_rx_time", None)
-                parsed.append((rx_t, msg))
-            except Exception:
-                continue
+        # Stream the capture line by line straight into the two columns
+        times = array("d")
+        msgs = []
+        t0 = None
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    msg = loads_bytes(line)
+                    rx_t = float(msg.pop("_rx_time", 0.0))
+                except Exception:
+                    continue  # blank or malformed line
+                if t0 is None:
+                    t0 = rx_t
+                times.append(rx_t - t0)
+                msgs.append(msg)
 
-        if not parsed:
+        if not msgs:
             return False
 
-        t0 = parsed[0][0]
-        for rx_t, msg in parsed:
-            self.items.append(ReplayItem(t=rx_t - t0, msg=msg))
+        self.times = times
+        self.msgs = msgs
 
         return True
 
     def start(self):
-        if not self.items:
+        if not self.msgs:
             return
         self.enabled = True
         self.index = 0
-        self.replay_start_wall = time.time()
+        self.replay_start = time.monotonic()
 
     def stop(self):
         self.enabled = False
 
-    def poll(self, max_per_frame=200):
-        if not self.enabled or not self.items:
+    def poll(self, now: float, max_per_frame=200):
+        """
+        Returns the messages due by `now` (time.monotonic()), capped per frame.
+        """
+        if not self.enabled or not self.msgs:
             return []
 
-        now = time.time()
-        elapsed = now - self.replay_start_wall
-        out = []
+        elapsed = now - self.replay_start
 
-        while self.index < len(self.items) and len(out) < max_per_frame:
-            item = self.items[self.index]
-            if item.t <= elapsed:
-                out.append(item.msg)
-                self.index += 1
-            else:
-                break
+        # Everything due by now, capped per frame
+        end = min(bisect_right(self.times, elapsed, self.index), self.index + max_per_frame)
+        out = self.msgs[self.index:end]
+        self.index = end
 
-        if self.index >= len(self.items):
+        if self.index >= len(self.msgs):
             self.stop()
 
         return out
@@ -177,25 +545,74 @@ def main():
     pygame.display.set_caption("PORTS Tactical Receiver (UDP + Pygame)")
     clock = pygame.time.Clock()
 
+    # Only these event types are handled; high-volume ones we ignore are kept off
+    # the queue entirely, and anything else left over is flushed each frame in C
+    HANDLED_EVENTS = [
+        pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN,
+        pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+    ]
+    pygame.event.set_blocked([
+        pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+        pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING,
+        pygame.FINGERMOTION, pygame.WINDOWMOVED,
+        pygame.WINDOWENTER, pygame.WINDOWLEAVE,
+    ])
+
     font = pygame.font.SysFont("Courier", 18)
     small = pygame.font.SysFont("Courier", 14)
     tiny = pygame.font.SysFont("Courier", 13)
 
+    # Radar rings (fit inside usable radar area below the HUD)
+    radar_left = 0
+    radar_top = HUD_HEIGHT
+    radar_right = RADAR_W
+    radar_bottom = H
+
+    radar_cx = (radar_left + radar_right) // 2
+    radar_cy = (radar_top + radar_bottom) // 2
+    center = (radar_cx, radar_cy)
+
+    usable_w = radar_right - radar_left
+
+    # Clipped look (uses width more aggressively)
+    max_r = (usable_w // 2) - 12
+    ring_step = 60
+
+    # Static radar background, rendered once and blitted each frame
+    radar_bg = pygame.Surface((W, H)).convert()
+    radar_bg.fill((5, 10, 30))
+
+    for r in range(ring_step, max_r + 1, ring_step):
+        pygame.draw.circle(radar_bg, (30, 40, 70), center, r, 1)
+
+    # Crosshair (only across usable radar region)
+    pygame.draw.line(radar_bg, (25, 35, 60), (radar_cx, radar_top), (radar_cx, radar_bottom), 1)
+    pygame.draw.line(radar_bg, (25, 35, 60), (radar_left, radar_cy), (radar_right, radar_cy), 1)
+
     # Radar coordinate/world area matches sender's world dimensions
     WORLD_W, WORLD_H = 800, 600
 
+    # Track dot sprites indexed by int(stale)
+    track_dots = (dot_surface(DOT_COLORS[0], 6), dot_surface(DOT_COLORS[1], 6))
+
+    # World -> radar pane scale factors (also inlined in the per-frame trail and track loops)
+    RADAR_SX = (RADAR_W - 1) / WORLD_W
+    RADAR_SY = (H - 1) / WORLD_H
+
     def world_to_radar(x, y):
         """
         Map sender world coords (0..800, 0..600) into left radar pane.
         """
-        rx = int((x / WORLD_W) * (RADAR_W - 1))
-        ry = int((y / WORLD_H) * (H - 1))
-        return rx, ry
+        return int(x * RADAR_SX), int(y * RADAR_SY)
 
     listen_port = 30001
     rx = UdpReceiver(listen_port=listen_port)
+    print(f"[receiver] UDP :{listen_port} | SO_RCVBUF granted {rx.rcvbuf // 1024} KiB")
 
     tracks = {}  # entity_id -> TrackState
+    track_ids = []  # sorted(tracks), kept in order as new entities arrive
+    label_cache = {}  # (entity_id, stale) -> rendered radar label
+    row_cache = {}  # entity_id -> (row inputs, rendered panel row)
 
     # Visual toggles
     show_history = True
@@ -215,7 +632,7 @@ def main():
     msg_count_total = 0
     msg_count_window = 0
     msg_rate = 0.0
-    msg_rate_timer = time.time()
+    msg_rate_timer = time.monotonic()
 
     max_seq_seen = None
     seq_drop_est = 0
@@ -223,6 +640,13 @@ def main():
     # Selection state
     selected_entity_id = None
 
+    # Dirty-rect presentation: only regions drawn this frame or last frame are pushed
+    prev_dirty = []
+    full_redraw = True
+
+    # Last HUD inputs; HUD strings are rebuilt only when these change
+    hud_inputs = None
+
     # Entity panel layout constants
     PANEL_HEADER_Y = 42
     PANEL_ROW_START_Y = PANEL_HEADER_Y + 22
@@ -235,10 +659,24 @@ def main():
     HDG_W = 5
     SPD_W = 4
 
-    def is_stale(track: TrackState, now_ts: float) -> bool:
-        if track.last_rx_time <= 0:
-            return True
-        return (now_ts - track.last_rx_time) > stale_seconds
+    # Static panel chrome (background, divider, title, hint, column headers and
+    # detail separator) is baked into the background surface
+    PANEL_X = RADAR_W + 35
+    pygame.draw.rect(radar_bg, (18, 22, 38), (PANEL_X, 0, PANEL_W, H))
+    pygame.draw.line(radar_bg, (60, 70, 100), (PANEL_X, 0), (PANEL_X, H), 2)
+    radar_bg.blit(font.render("ENTITY LIST", True, (220, 220, 220)), (PANEL_X + 12, 12))
+    radar_bg.blit(tiny.render("Click row to select/lock", True, (100, 130, 160)), (PANEL_X + 12, 32))
+    header_text = f"{'ID':<{ID_W}}{'TYPE':<{TYPE_W}}{'X,Y':<{XY_W}}{'HDG':<{HDG_W}}{'SPD':<{SPD_W}}"
+    radar_bg.blit(tiny.render(header_text, True, (180, 180, 180)), (PANEL_X + 22, PANEL_HEADER_Y + 6))
+    pygame.draw.line(radar_bg, (60, 70, 100), (PANEL_X + 8, H - 100), (W - 8, H - 100), 1)
+
+    # Alternating row backgrounds as one stripe surface; each frame blits only
+    # the slice covering the visible rows
+    stripe_rows = max(0, (H - PANEL_ROW_START_Y - 90) // PANEL_ROW_H)
+    row_stripes = pygame.Surface((PANEL_W - 12, max(1, stripe_rows * PANEL_ROW_H))).convert()
+    row_stripes.fill((18, 22, 38))
+    for i in range(0, stripe_rows, 2):
+        row_stripes.fill((22, 27, 45), (0, i * PANEL_ROW_H, PANEL_W - 12, PANEL_ROW_H))
 
     def process_message(msg: dict, rx_time: float):
         nonlocal msg_count_total, msg_count_window, max_seq_seen, seq_drop_est
@@ -267,13 +705,17 @@ def main():
 
         if eid not in tracks:
             tracks[eid] = TrackState(history_len=25)
+            insort(track_ids, eid)
 
         tracks[eid].update_from_msg(msg, rx_time)
 
     try:
         while True:
             # --- input ---
-            for event in pygame.event.get():
+            events = pygame.event.get(HANDLED_EVENTS)
+            # No pump: anything arriving after get() stays queued for next frame
+            pygame.event.clear(pump=False)
+            for event in events:
                 if event.type == pygame.QUIT:
                     return
 
@@ -297,19 +739,25 @@ def main():
                             ok = replayer.load(capture_path)
                             if ok:
                                 tracks.clear()
+                                track_ids.clear()
+                                label_cache.clear()
+                                row_cache.clear()
                                 replayer.start()
                                 mode = "REPLAY"
                                 # keep selection if that ID reappears during replay; no need to clear
                     elif event.key == pygame.K_ESCAPE:
                         return
 
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    full_redraw = True
+
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     mx, my = event.pos
 
                     # Click in right-side entity panel?
                     panel_x = RADAR_W
                     if mx >= panel_x:
-                        sorted_ids = sorted(tracks.keys())
+                        sorted_ids = track_ids
                         max_rows = (H - PANEL_ROW_START_Y - 90) // PANEL_ROW_H
                         visible_ids = sorted_ids[:max_rows]
 
@@ -318,104 +766,102 @@ def main():
                             if 0 <= row_index < len(visible_ids):
                                 selected_entity_id = visible_ids[row_index]
 
-            now = time.time()
+            # One clock read per frame: monotonic for staleness/rates, wall time for captures
+            now = time.monotonic()
 
             # --- ingest ---
             if mode == "LIVE":
                 msgs = rx.poll_messages()
+                if msgs and recorder.enabled:
+                    recorder.write_batch(msgs, time.time())
                 for msg in msgs:
-                    recorder.write(msg)
                     process_message(msg, rx_time=now)
             else:
-                msgs = replayer.poll()
+                msgs = replayer.poll(now)
                 for msg in msgs:
                     process_message(msg, rx_time=now)
 
             # Update msg/sec
-            rate_now = time.time()
-            dt_rate = rate_now - msg_rate_timer
+            dt_rate = now - msg_rate_timer
             if dt_rate >= 1.0:
                 msg_rate = msg_count_window / dt_rate
                 msg_count_window = 0
-                msg_rate_timer = rate_now
+                msg_rate_timer = now
 
-            stale_count = sum(1 for tr in tracks.values() if is_stale(tr, now))
+            # Stale flags evaluated once per frame and shared by every render pass
+            stale_cutoff = now - stale_seconds
+            stale_by_id = {
+                eid: tr.last_rx_time <= 0 or tr.last_rx_time < stale_cutoff
+                for eid, tr in tracks.items()
+            }
+            stale_count = sum(stale_by_id.values())
 
             # --- render ---
-            screen.fill((5, 10, 30))
-
-            # Radar pane background
-            pygame.draw.rect(screen, (5, 10, 30), (0, 0, RADAR_W, H))
-
-            # Radar rings (fit inside usable radar area below the HUD)
-            radar_left = 0
-            radar_top = HUD_HEIGHT
-            radar_right = RADAR_W
-            radar_bottom = H
-
-            radar_cx = (radar_left + radar_right) // 2
-            radar_cy = (radar_top + radar_bottom) // 2
-            center = (radar_cx, radar_cy)
-
-            usable_w = radar_right - radar_left
-            usable_h = radar_bottom - radar_top
-
-            # Clipped look (uses width more aggressively)
-            max_r = (usable_w // 2) - 12
-            ring_step = 60
-
-            for r in range(ring_step, max_r + 1, ring_step):
-                pygame.draw.circle(screen, (30, 40, 70), center, r, 1)
-
-            # Crosshair (only across usable radar region)
-            pygame.draw.line(screen, (25, 35, 60), (radar_cx, radar_top), (radar_cx, radar_bottom), 1)
-            pygame.draw.line(screen, (25, 35, 60), (radar_left, radar_cy), (radar_right, radar_cy), 1)
-
-            # Draw tracks on radar pane
-            for eid in sorted(tracks.keys()):
-                tr = tracks[eid]
-                stale = is_stale(tr, now)
-
-                if stale:
-                    dot_color = (255, 60, 60)
-                    vec_color = (255, 210, 0)
-                    trail_base = (255, 80, 80)
-                else:
-                    dot_color = (0, 255, 0)
-                    vec_color = (255, 255, 0)
-                    trail_base = (0, 255, 0)
-
-                # Trail (map world history to radar pane)
-                if show_history and len(tr.history) > 1:
-                    hist = list(tr.history)
-                    for i, pos in enumerate(hist):
-                        px, py = world_to_radar(pos[0], pos[1])
-                        alpha = int((i / max(1, len(hist) - 1)) * 140)
-                        scale = alpha / 140.0 if 140.0 > 0 else 1.0
-                        c = (
-                            int(trail_base[0] * scale),
-                            int(trail_base[1] * scale),
-                            int(trail_base[2] * scale),
-                        )
+            # Static background (fill + rings + crosshair) is pre-rendered once
+            screen.blit(radar_bg, (0, 0))
+            dirty = []
+
+            # Trails and track dots go out in one batched blit: trail points first, dots on top
+            sprite_blits = []
+            if show_history:
+                for eid, tr in tracks.items():
+                    n = tr.hist_count
+                    if n < 2:
+                        continue
+                    trail_base = TRAIL_COLORS[stale_by_id[eid]]
+
+                    # Walk the ring oldest -> newest; oldest point is dimmest
+                    hist_x, hist_y, hist_len = tr.hist_x, tr.hist_y, tr.history_len
+                    start = tr.hist_head - n
+                    sprites = trail_sprites(trail_base, n)
+                    for i in range(n):
+                        j = (start + i) % hist_len
+                        px = int(hist_x[j] * RADAR_SX)
+                        py = int(hist_y[j] * RADAR_SY)
                         if py >= HUD_HEIGHT:
-                            pygame.draw.circle(screen, c, (px, py), 2)
+                            sprite_blits.append((sprites[i], (px - 2, py - 2)))
+
+                    # Trail bounding box (only the filled part of the ring)
+                    if n < hist_len:
+                        hist_x, hist_y = hist_x[:n], hist_y[:n]
+                    x0, y0 = world_to_radar(min(hist_x), min(hist_y))
+                    x1, y1 = world_to_radar(max(hist_x), max(hist_y))
+                    dirty.append(pygame.Rect(x0 - 2, y0 - 2, x1 - x0 + 5, y1 - y0 + 5))
+
+            # Track screen positions (hot names bound to locals for the per-track loops)
+            draw_circle = pygame.draw.circle
+            draw_line = pygame.draw.line
+            Rect = pygame.Rect
+            add_dirty = dirty.append
+            track_pos = []
+            for eid in track_ids:
+                tr = tracks[eid]
+                stale = stale_by_id[eid]
 
                 # Map current world pos to radar pane
-                rx_x, rx_y = world_to_radar(tr.x, tr.y)
+                rx_x = int(tr.x * RADAR_SX)
+                rx_y = int(tr.y * RADAR_SY)
 
                 # Keep symbols out of radar HUD strip
                 if rx_y < HUD_HEIGHT:
                     rx_y = HUD_HEIGHT
 
-                # Dot
-                pygame.draw.circle(screen, dot_color, (rx_x, rx_y), 6)
+                # Symbol area: dot, heading vector, selection rings/brackets
+                add_dirty(Rect(rx_x - 20, rx_y - 20, 41, 41))
+
+                sprite_blits.append((track_dots[stale], (rx_x - 6, rx_y - 6)))
+                track_pos.append((eid, tr, stale, rx_x, rx_y))
+
+            blit_batch(screen, sprite_blits)
+
+            # Vectors, labels and selection marks on top of the dots
+            for eid, tr, stale, rx_x, rx_y in track_pos:
+                vec_color = VEC_COLORS[stale]
 
                 # Heading vector
                 if show_heading:
-                    rad = math.radians(tr.heading)
-                    vx = math.sin(rad) * 16
-                    vy = -math.cos(rad) * 16
-                    pygame.draw.line(
+                    vx, vy = _HEADING_VEC[int(tr.heading * 2) % 720]
+                    draw_line(
                         screen,
                         vec_color,
                         (rx_x, rx_y),
@@ -425,87 +871,85 @@ def main():
 
                 # Label
                 if show_labels:
-                    label = f"{tr.entity_id}"
-                    if stale:
-                        label += " (stale)"
+                    label_surf = label_cache.get((eid, stale))
+                    if label_surf is None:
+                        label = f"{tr.entity_id}"
+                        if stale:
+                            label += " (stale)"
+                        label_surf = small.render(label, True, (220, 220, 220))
+                        label_cache[(eid, stale)] = label_surf
                     lx = rx_x + 8
                     ly = rx_y - 10
                     if ly < HUD_HEIGHT:
                         ly = HUD_HEIGHT
                     lx = max(10, min(lx, RADAR_W - 140))
                     ly = max(HUD_HEIGHT, min(ly, H - 20))
-                    screen.blit(small.render(label, True, (220, 220, 220)), (lx, ly))
+                    add_dirty(screen.blit(label_surf, (lx, ly)))
 
                 # Selection highlight on radar
                 if eid == selected_entity_id:
                     sel_c = (120, 200, 255)
-                    pygame.draw.circle(screen, sel_c, (rx_x, rx_y), 12, 2)
-                    pygame.draw.circle(screen, sel_c, (rx_x, rx_y), 18, 1)
-                    pygame.draw.line(screen, sel_c, (rx_x - 10, rx_y), (rx_x + 10, rx_y), 1)
-                    pygame.draw.line(screen, sel_c, (rx_x, rx_y - 10), (rx_x, rx_y + 10), 1)
+                    draw_circle(screen, sel_c, (rx_x, rx_y), 12, 2)
+                    draw_circle(screen, sel_c, (rx_x, rx_y), 18, 1)
+                    draw_line(screen, sel_c, (rx_x - 10, rx_y), (rx_x + 10, rx_y), 1)
+                    draw_line(screen, sel_c, (rx_x, rx_y - 10), (rx_x, rx_y + 10), 1)
 
             # Radar HUD strip (draw after tracks so it always stays readable)
-            pygame.draw.rect(screen, (5, 10, 30), (0, 0, RADAR_W, HUD_HEIGHT))
-
-            # Radar HUD text
-            hud1 = f"MODE: {mode}   PORT: {listen_port}   ENTITIES: {len(tracks)}   STALE: {stale_count}"
-            rec = "ON" if recorder.enabled else "OFF"
-            seq_text = "-" if max_seq_seen is None else str(max_seq_seen)
-            hud2 = f"MSG/S: {msg_rate:5.1f}   TOTAL: {msg_count_total}   SEQ: {seq_text}   DROP: {seq_drop_est}"
-            hud3 = f"[H]Trail  [V]Vector  [L]Labels  [R]Record({rec})  [P]Replay  [ESC]Quit"
-
-            screen.blit(font.render(hud1, True, (200, 200, 200)), (20, 20))
-            screen.blit(font.render(hud2, True, (170, 170, 170)), (20, 45))
-            screen.blit(font.render(hud3, True, (100, 100, 100)), (20, 70))
+            dirty.append(pygame.draw.rect(screen, (5, 10, 30), (0, 0, RADAR_W, HUD_HEIGHT)))
+
+            # Radar HUD text (re-formatted only when an input changes)
+            hud_key = (
+                mode, len(tracks), stale_count, recorder.enabled, recorder.error,
+                msg_rate, msg_count_total, max_seq_seen, seq_drop_est,
+            )
+            if hud_key != hud_inputs:
+                hud_inputs = hud_key
+                hud1 = f"MODE: {mode}   PORT: {listen_port}   ENTITIES: {len(tracks)}   STALE: {stale_count}"
+                rec = "ON" if recorder.enabled else ("FAILED" if recorder.error else "OFF")
+                seq_text = "-" if max_seq_seen is None else str(max_seq_seen)
+                hud2 = f"MSG/S: {msg_rate:5.1f}   TOTAL: {msg_count_total}   SEQ: {seq_text}   DROP: {seq_drop_est}"
+                hud3 = f"[H]Trail  [V]Vector  [L]Labels  [R]Record({rec})  [P]Replay  [ESC]Quit"
+
+            screen.blit(text_surface(font, hud1, (200, 200, 200)), (20, 20))
+            screen.blit(text_surface(font, hud2, (170, 170, 170)), (20, 45))
+            screen.blit(text_surface(font, hud3, (100, 100, 100)), (20, 70))
 
             if mode == "REPLAY" and not replayer.enabled:
-                screen.blit(
-                    font.render("REPLAY DONE (press P to return to LIVE)", True, (180, 180, 180)),
+                dirty.append(screen.blit(
+                    text_surface(font, "REPLAY DONE (press P to return to LIVE)", (180, 180, 180)),
                     (20, 95),
-                )
+                ))
 
             # --- Right-side entity panel ---
-            panel_x = RADAR_W+35
-            pygame.draw.rect(screen, (18, 22, 38), (panel_x, 0, PANEL_W, H))
-            pygame.draw.line(screen, (60, 70, 100), (panel_x, 0), (panel_x, H), 2)
-
-            # Panel title
-            screen.blit(font.render("ENTITY LIST", True, (220, 220, 220)), (panel_x + 12, 12))
-
-            # NEW: Interaction Hint (Placed right under the title)
-            hint_text = "Click row to select/lock"
-            screen.blit(tiny.render(hint_text, True, (100, 130, 160)), (panel_x + 12, 32))
-
-            # Column headers (Shifted down slightly to accommodate the hint)
-            header_y = 48
-            header_text = f"{'ID':<{ID_W}}{'TYPE':<{TYPE_W}}{'X,Y':<{XY_W}}{'HDG':<{HDG_W}}{'SPD':<{SPD_W}}"
-            screen.blit(tiny.render(header_text, True, (180, 180, 180)), (panel_x + 22, header_y))
+            panel_x = PANEL_X
+            dirty.append(pygame.Rect(RADAR_W, 0, W - RADAR_W, H))
+            # Restore the baked panel chrome over anything the radar pass spilled into it
+            screen.blit(radar_bg, (panel_x - 1, 0), (panel_x - 1, 0, W - panel_x + 1, H))
 
             # Rows
             row_y = PANEL_ROW_START_Y
             row_h = PANEL_ROW_H
 
-            sorted_ids = sorted(tracks.keys())
+            sorted_ids = track_ids
             max_rows = (H - row_y - 90) // row_h  # leave room for footer/help + selected details
             visible_ids = sorted_ids[:max_rows]
 
-            for i, eid in enumerate(visible_ids):
+            if visible_ids:
+                screen.blit(
+                    row_stripes, (panel_x + 6, row_y - 2),
+                    (0, 0, PANEL_W - 12, len(visible_ids) * row_h),
+                )
+
+            for eid in visible_ids:
                 tr = tracks[eid]
-                stale = is_stale(tr, now)
+                stale = stale_by_id[eid]
                 is_selected = (eid == selected_entity_id)
 
-                row_rect = pygame.Rect(panel_x + 6, row_y - 2, PANEL_W - 12, row_h)
-
-                # alternating row background / selected row highlight
+                # selected row highlight
                 if is_selected:
+                    row_rect = pygame.Rect(panel_x + 6, row_y - 2, PANEL_W - 12, row_h)
                     pygame.draw.rect(screen, (55, 70, 120), row_rect)
                     pygame.draw.rect(screen, (180, 210, 255), row_rect, 1)
-                elif i % 2 == 0:
-                    pygame.draw.rect(screen, (22, 27, 45), row_rect)
-
-                txt_color = (255, 120, 120) if stale else (200, 230, 200)
-                if is_selected:
-                    txt_color = (235, 245, 255)
 
                 # tiny status dot
                 dot_c = (255, 80, 80) if stale else (0, 220, 120)
@@ -513,19 +957,34 @@ def main():
                     dot_c = (120, 220, 255)
                 pygame.draw.circle(screen, dot_c, (panel_x + 14, row_y + 8), 4)
 
-                # text columns (fixed-width)
-                xy_text = f"{int(tr.x):>3},{int(tr.y):>3}"
-                hdg_text = f"{int(tr.heading):03d}"   # always 3 digits like 005, 090, 270
-
-                row_text = (
-                    f"{tr.entity_id:<{ID_W}}"
-                    f"{str(tr.entity_type)[:6]:<{TYPE_W}}"
-                    f"{xy_text:<{XY_W}}"
-                    f"{hdg_text:<{HDG_W}}"
-                    f"{tr.speed:>3.1f}"
+                # row text is re-rendered only when a displayed value changes
+                row_key = (
+                    stale, is_selected, tr.entity_type,
+                    int(tr.x), int(tr.y), int(tr.heading), round(tr.speed, 1),
                 )
+                cached = row_cache.get(eid)
+                if cached is not None and cached[0] == row_key:
+                    row_surf = cached[1]
+                else:
+                    txt_color = (255, 120, 120) if stale else (200, 230, 200)
+                    if is_selected:
+                        txt_color = (235, 245, 255)
+
+                    # text columns (fixed-width)
+                    xy_text = f"{int(tr.x):>3},{int(tr.y):>3}"
+                    hdg_text = f"{int(tr.heading):03d}"   # always 3 digits like 005, 090, 270
+
+                    row_text = (
+                        f"{tr.entity_id:<{ID_W}}"
+                        f"{str(tr.entity_type)[:6]:<{TYPE_W}}"
+                        f"{xy_text:<{XY_W}}"
+                        f"{hdg_text:<{HDG_W}}"
+                        f"{tr.speed:>3.1f}"
+                    )
+                    row_surf = tiny.render(row_text, True, txt_color)
+                    row_cache[eid] = (row_key, row_surf)
 
-                screen.blit(tiny.render(row_text, True, txt_color), (panel_x + 22, row_y))
+                screen.blit(row_surf, (panel_x + 22, row_y))
 
                 row_y += row_h
 
@@ -534,11 +993,10 @@ def main():
             # Bottom help line (small/dim)
             help_y = H - 20
             help_text = f"TRACKS {len(visible_ids)}/{len(sorted_ids)}   STALE=RED"
-            screen.blit(tiny.render(help_text, True, (80, 90, 110)), (panel_x + 10, help_y))
+            screen.blit(text_surface(tiny, help_text, (80, 90, 110)), (panel_x + 10, help_y))
 
             # Detail block starts above help line
             detail_start_y = H - 100
-            pygame.draw.line(screen, (60, 70, 100), (panel_x + 8, detail_start_y), (W - 8, detail_start_y), 1)
 
             # Selected entity detail block
             if selected_entity_id in tracks:
@@ -561,15 +1019,15 @@ def main():
                 line3_y = detail_start_y + 48
 
                 screen.blit(
-                    tiny.render(f"ID: {tr.entity_id}  [{tr.entity_type}]", True, (200, 220, 255)),
+                    text_surface(tiny, f"ID: {tr.entity_id}  [{tr.entity_type}]", (200, 220, 255)),
                     (panel_x + 10, line1_y),
                 )
                 screen.blit(
-                    tiny.render(f"RNG: {int(range_val)}m  BRG: {int(bearing_deg):03d}\N{DEGREE SIGN}", True, (150, 180, 255)),
+                    text_surface(tiny, f"RNG: {int(range_val)}m  BRG: {int(bearing_deg):03d}\N{DEGREE SIGN}", (150, 180, 255)),
                     (panel_x + 10, line2_y),
                 )
                 screen.blit(
-                    tiny.render(f"HDG: {int(tr.heading):03d}\N{DEGREE SIGN}  SPD: {tr.speed:.1f} kts", True, (120, 160, 255)),
+                    text_surface(tiny, f"HDG: {int(tr.heading):03d}\N{DEGREE SIGN}  SPD: {tr.speed:.1f} kts", (120, 160, 255)),
                     (panel_x + 10, line3_y),
                 )
 
@@ -599,12 +1057,17 @@ def main():
 
             else:
                 screen.blit(
-                    tiny.render("SELECTED: NONE", True, (100, 100, 100)),
+                    text_surface(tiny, "SELECTED: NONE", (100, 100, 100)),
                     (panel_x + 10, detail_start_y + 8),
                 )
 
 
-            pygame.display.flip()
+            if full_redraw:
+                pygame.display.flip()
+                full_redraw = False
+            else:
+                pygame.display.update(prev_dirty + dirty)
+            prev_dirty = dirty
             clock.tick(60)
 
     finally:
@@ -3,15 +3,131 @@ import json
 import time
 import math
 import argparse
+import ctypes
+import errno
+import sys
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from random import Random
 
+try:
+    import orjson  # optional: faster JSON encoding straight to bytes
+except ImportError:
+    orjson = None
+
 
 def wrap360(deg: float) -> float:
+    # Headings here are at most one turn out of range: a single add/subtract
+    # (exact, same result as %) covers them; % handles anything further out
+    if deg >= 360.0:
+        deg -= 360.0
+    elif deg < 0.0:
+        deg += 360.0
+    else:
+        return deg
+    if 0.0 <= deg < 360.0:
+        return deg
     return deg % 360.0
 
 
+# JSON -> UTF-8 bytes; orjson when installed, stdlib json otherwise
+if orjson is not None:
+    dumps_bytes = orjson.dumps
+else:
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Kinematics lookup tables at 0.1° resolution (index = int(heading * 10))
+_SIN_TENTH_DEG = tuple(math.sin(math.radians(i * 0.1)) for i in range(3600))
+_COS_TENTH_DEG = tuple(math.cos(math.radians(i * 0.1)) for i in range(3600))
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class SendMmsgBatch:
+    """
+    Linux sendmmsg(2) via ctypes: one syscall sends up to `count` datagrams
+    on a connected socket (no per-message address). Header/iovec arrays are
+    allocated once.
+    """
+
+    def __init__(self, fd: int, count: int):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._sendmmsg = libc.sendmmsg
+        self._sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        self._sendmmsg.restype = ctypes.c_int
+
+        self.fd = fd
+        self.count = count
+        self.refused = 0
+
+        self._iovecs = (_IoVec * count)()
+        self._msgs = (_MMsgHdr * count)()
+        for i in range(count):
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+
+    def send(self, payloads) -> int:
+        """
+        Sends all payloads (bytes), in chunks of `count`. Returns how many the
+        kernel accepted; stops early if the socket would block or the
+        destination keeps refusing (then `refused` holds the unsent count).
+        """
+        self.refused = 0
+        sent = 0
+        total = len(payloads)
+        iovecs, msgs = self._iovecs, self._msgs
+        retried = False
+        while sent < total:
+            n = min(total - sent, self.count)
+            chunk = payloads[sent:sent + n]
+            # One contiguous buffer per call: iovecs are base + offset, no per-packet pointer casts
+            blob = b"".join(chunk)
+            addr = ctypes.cast(blob, ctypes.c_void_p).value
+            for i, data in enumerate(chunk):
+                iov = iovecs[i]
+                iov.iov_base = addr
+                size = len(data)
+                iov.iov_len = size
+                addr += size
+            r = self._sendmmsg(self.fd, msgs, n, 0)
+            if r < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                if err == errno.ECONNREFUSED:
+                    # Stale ICMP error from an earlier datagram; reporting it cleared it,
+                    # so retry once. Refused again means no receiver: drop the rest.
+                    if retried:
+                        self.refused = total - sent
+                        break
+                    retried = True
+                    continue
+                raise OSError(err, "sendmmsg failed")
+            retried = False
+            sent += r
+        return sent
+
+
 @dataclass
 class Entity:
     entity_id: int
@@ -48,6 +164,15 @@ class UdpSimSender:
         self.dest = (dest_ip, dest_port)
         self.hz = hz
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Room for a whole tick's burst; nonblocking so a full buffer drops packets
+        # (counted) instead of stalling the tick
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        self.sock.setblocking(False)
+        # Fixed destination: connect once so sends skip per-packet address handling
+        self.sock.connect(self.dest)
         self.rng = Random(seed)
 
         # Sim bounds
@@ -58,33 +183,73 @@ class UdpSimSender:
         self.top_margin = 110
         self.bottom_margin = 20
 
+        # Bounce limits (left, right, top, bottom), fixed for the run
+        self.bounds = (
+            self.left_margin,
+            self.w - self.right_margin,
+            self.top_margin,
+            self.h - self.bottom_margin,
+        )
+
         self.seq = 0
         self.entities = self._init_entities(count=entities)
 
+        # One sendmmsg(2) per tick on Linux; per-packet send elsewhere
+        self._mmsg = None
+        if sys.platform.startswith("linux") and self.entities:
+            try:
+                self._mmsg = SendMmsgBatch(self.sock.fileno(), len(self.entities))
+            except (OSError, AttributeError):
+                self._mmsg = None
+
         # Fault injection config
         self.faults_enabled = faults_enabled
         self.fault_check_interval = max(0.1, float(fault_check_interval))
         self.fault_trigger_prob = max(0.0, min(1.0, float(fault_trigger_prob)))
         self.fault_debug = fault_debug
-        self.last_fault_check = time.time()
+        self.last_fault_check = time.monotonic()
 
-        # Per-entity fault states (keyed by entity_id int)
-        self.faults = {ent.entity_id: self._default_fault_state() for ent in self.entities}
+        # Per-entity fault state as parallel lists, indexed like self.entities
+        n = len(self.entities)
+        self.jam_until = [0.0] * n              # if now < jam_until, suppress sends
+        self.drop_burst_remaining = [0] * n     # drop next N packets
+        self.heading_noise_until = [0.0] * n    # if now < this, apply random heading noise
+        self.heading_noise_deg = [0.0] * n      # max +/- noise
 
         # Optional counters (useful later if you want sender-side stats)
         self.total_packets_attempted = 0
         self.total_packets_sent = 0
         self.total_packets_dropped_fault = 0
         self.total_packets_jammed_fault = 0
-
-    def _default_fault_state(self):
-        return {
-            "jam_until": 0.0,               # if now < jam_until, suppress sends
-            "drop_burst_remaining": 0,      # drop next N packets
-            "heading_noise_until": 0.0,     # if now < this, apply random heading noise
-            "heading_noise_deg": 0.0,       # max +/- noise
+        self.total_packets_dropped_sndbuf = 0
+        self.total_packets_refused = 0
+
+        # Outgoing EntityState, refilled per entity by send_all()
+        self._msg = {
+            "msg_type": "EntityState",
+            "entity_id": 0,
+            "entity_type": "",
+            "x": 0.0,
+            "y": 0.0,
+            "heading_deg": 0.0,
+            "speed": 0.0,
+            "status": "OK",
+            "seq": 0,
+            "timestamp_utc": "",
         }
 
+        # timestamp_utc: the date/time part only changes once per second
+        self._ts_sec = None
+        self._ts_prefix = ""
+
+    def _utc_timestamp(self, t: float) -> str:
+        """ISO-8601 UTC with millisecond precision, e.g. 2026-02-23T22:10:10.123Z."""
+        sec = int(t)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        return f"{self._ts_prefix}.{int((t - sec) * 1000):03d}Z"
+
     def _init_entities(self, count: int):
         # Some types to rotate through
         types = ["SUB", "UUV", "SHIP", "BUI", "DRONE", "CONTACT"]
@@ -100,52 +265,62 @@ class UdpSimSender:
         return out
 
     def _bounce(self, ent: Entity):
-        left = self.left_margin
-        right = self.w - self.right_margin
-        top = self.top_margin
-        bottom = self.h - self.bottom_margin
+        left, right, top, bottom = self.bounds
+        heading = ent.heading
 
-        # Bounce top/bottom (invert Y velocity)
+        # Bounce top/bottom (invert Y velocity), clamp back inside
         if ent.y <= top or ent.y >= bottom:
-            ent.heading = wrap360(180.0 - ent.heading)
-            ent.y = top + 1 if ent.y <= top else bottom - 1
+            heading = 180.0 - heading
+            ent.y = min(max(ent.y, top + 1), bottom - 1)
 
-        # Bounce left/right (invert X velocity)
+        # Bounce left/right (invert X velocity), clamp back inside
         if ent.x <= left or ent.x >= right:
-            ent.heading = wrap360(360.0 - ent.heading)
-            ent.x = left + 1 if ent.x <= left else right - 1
+            heading = 360.0 - heading
+            ent.x = min(max(ent.x, left + 1), right - 1)
 
-        ent.heading = wrap360(ent.heading)
+        # Reflections are linear mod 360, so one wrap at the end suffices
+        ent.heading = wrap360(heading)
 
     def step(self, dt: float):
+        # Per-tick invariants bound to locals for the entity loop
+        rand = self.rng.random
+        wander = 10.0 * dt
+        bounce = self._bounce
+        left, right, top, bottom = self.bounds
+        sin_t, cos_t = _SIN_TENTH_DEG, _COS_TENTH_DEG
+
         # Small heading wander (looks more organic)
         for ent in self.entities:
-            if ent.speed > 0.01:
-                ent.heading = wrap360(ent.heading + (self.rng.random() - 0.5) * 10.0 * dt)
+            speed = ent.speed
+            if speed > 0.01:
+                heading = wrap360(ent.heading + (rand() - 0.5) * wander)
+                ent.heading = heading
 
-                rad = math.radians(ent.heading)
-                ent.x += math.sin(rad) * ent.speed
-                ent.y -= math.cos(rad) * ent.speed
+                h_idx = int(heading * 10) % 3600
+                x = ent.x + sin_t[h_idx] * speed
+                y = ent.y - cos_t[h_idx] * speed
+                ent.x = x
+                ent.y = y
 
-                self._bounce(ent)
+                # Common case: still strictly inside the bounds, nothing to reflect
+                if not (left < x < right and top < y < bottom):
+                    bounce(ent)
 
     # ---------------------------
     # Fault injection
     # ---------------------------
 
-    def _fault_active(self, f: dict, now_ts: float) -> bool:
+    def _fault_active(self, i: int, now_ts: float) -> bool:
         return (
-            (now_ts < f["jam_until"]) or
-            (f["drop_burst_remaining"] > 0) or
-            (now_ts < f["heading_noise_until"])
+            (now_ts < self.jam_until[i]) or
+            (self.drop_burst_remaining[i] > 0) or
+            (now_ts < self.heading_noise_until[i])
         )
 
-    def maybe_inject_random_fault(self):
+    def maybe_inject_random_fault(self, now_ts: float):
         if not self.faults_enabled or not self.entities:
             return
 
-        now_ts = time.time()
-
         # Throttle checks (e.g., once per second)
         if (now_ts - self.last_fault_check) < self.fault_check_interval:
             return
@@ -155,13 +330,13 @@ class UdpSimSender:
         if self.rng.random() > self.fault_trigger_prob:
             return
 
-        # Pick a random entity
-        ent = self.rng.choice(self.entities)
+        # Pick a random entity (same draw as rng.choice, so seeded runs are unchanged)
+        i = self.rng.randrange(len(self.entities))
+        ent = self.entities[i]
         eid = ent.entity_id
-        f = self.faults.setdefault(eid, self._default_fault_state())
 
         # Keep it simple: only trigger if entity isn't already faulted
-        if self._fault_active(f, now_ts):
+        if self._fault_active(i, now_ts):
             return
 
         # Choose a fault type
@@ -169,59 +344,55 @@ class UdpSimSender:
 
         if fault_type == "jam":
             dur = self.rng.uniform(2.0, 6.0)
-            f["jam_until"] = now_ts + dur
+            self.jam_until[i] = now_ts + dur
             if self.fault_debug:
                 print(f"[FAULT] EID {eid} ({ent.entity_type}) JAM / LOSS OF SIGNAL for {dur:.1f}s")
 
         elif fault_type == "drop_burst":
             count = self.rng.randint(5, 20)
-            f["drop_burst_remaining"] += count
+            self.drop_burst_remaining[i] += count
             if self.fault_debug:
                 print(f"[FAULT] EID {eid} ({ent.entity_type}) DROP BURST next {count} packets")
 
         elif fault_type == "heading_noise":
             dur = self.rng.uniform(3.0, 8.0)
             deg = self.rng.choice([5.0, 8.0, 12.0])
-            f["heading_noise_until"] = now_ts + dur
-            f["heading_noise_deg"] = deg
+            self.heading_noise_until[i] = now_ts + dur
+            self.heading_noise_deg[i] = deg
             if self.fault_debug:
                 print(f"[FAULT] EID {eid} ({ent.entity_type}) HEADING NOISE ±{deg:.0f}° for {dur:.1f}s")
 
-    def apply_faults_to_msg(self, ent: Entity, msg: dict):
+    def apply_faults_to_msg(self, i: int, msg: dict, now_ts: float):
         """
-        Apply active faults for this entity.
+        Apply active faults for entity index i as of now_ts (the tick's clock snapshot).
         Returns: (should_send: bool, out_msg: dict)
         """
-        now_ts = time.time()
-        eid = ent.entity_id
-        f = self.faults.setdefault(eid, self._default_fault_state())
-
         # 1) Jam / loss of signal (suppress send)
-        if now_ts < f["jam_until"]:
+        if now_ts < self.jam_until[i]:
             self.total_packets_jammed_fault += 1
             return False, msg
 
         # 2) Drop burst (drop next N sends)
-        if f["drop_burst_remaining"] > 0:
-            f["drop_burst_remaining"] -= 1
+        if self.drop_burst_remaining[i] > 0:
+            self.drop_burst_remaining[i] -= 1
             self.total_packets_dropped_fault += 1
             return False, msg
 
-        # 3) Heading noise (modify outgoing heading only, not the true entity state)
-        out = dict(msg)
-        if now_ts < f["heading_noise_until"]:
-            noise = self.rng.uniform(-f["heading_noise_deg"], f["heading_noise_deg"])
+        # 3) Heading noise (edits the outgoing msg in place, not the true entity state)
+        if now_ts < self.heading_noise_until[i]:
+            deg = self.heading_noise_deg[i]
+            noise = self.rng.uniform(-deg, deg)
             try:
-                out["heading_deg"] = wrap360(float(out.get("heading_deg", 0.0)) + noise)
+                msg["heading_deg"] = wrap360(float(msg.get("heading_deg", 0.0)) + noise)
                 # Optional status hint for receiver panel/debugging
-                out["status"] = "NOISY"
+                msg["status"] = "NOISY"
             except Exception:
                 pass
         else:
             # Expired noise cleanup
-            f["heading_noise_deg"] = 0.0
+            self.heading_noise_deg[i] = 0.0
 
-        return True, out
+        return True, msg
 
     # ---------------------------
     # Send loop
@@ -229,35 +400,74 @@ class UdpSimSender:
 
     def send_all(self):
         self.seq += 1
-        ts = datetime.now(timezone.utc).isoformat()
+        ts = self._utc_timestamp(time.time())
+        # Fault deadlines run on the monotonic clock (immune to wall-clock steps);
+        # one snapshot per tick is shared by every fault check
+        now_ts = time.monotonic()
 
         # Potentially start a new random fault event
-        self.maybe_inject_random_fault()
+        self.maybe_inject_random_fault(now_ts)
 
-        for ent in self.entities:
+        # One message dict reused for every entity: it is encoded before the next
+        # overwrite, and its key order (the wire order) is fixed at creation
+        msg = self._msg
+        msg["seq"] = self.seq
+        msg["timestamp_utc"] = ts
+
+        payloads = []
+        encode = dumps_bytes
+        for i, ent in enumerate(self.entities):
             self.total_packets_attempted += 1
 
-            msg = {
-                "msg_type": "EntityState",
-                "entity_id": ent.entity_id,
-                "entity_type": ent.entity_type,
-                "x": float(ent.x),
-                "y": float(ent.y),
-                "heading_deg": float(ent.heading),
-                "speed": float(ent.speed),
-                "status": ent.status,
-                "seq": self.seq,
-                "timestamp_utc": ts,
-            }
+            msg["entity_id"] = ent.entity_id
+            msg["entity_type"] = ent.entity_type
+            msg["x"] = float(ent.x)
+            msg["y"] = float(ent.y)
+            msg["heading_deg"] = float(ent.heading)
+            msg["speed"] = float(ent.speed)
+            msg["status"] = ent.status
 
             if self.faults_enabled:
-                should_send, msg = self.apply_faults_to_msg(ent, msg)
+                should_send, msg = self.apply_faults_to_msg(i, msg, now_ts)
                 if not should_send:
                     continue
 
-            data = json.dumps(msg).encode("utf-8")
-            self.sock.sendto(data, self.dest)
-            self.total_packets_sent += 1
+            payloads.append(encode(msg))
+
+        self.total_packets_sent += self._send_payloads(payloads)
+
+    def _send_payloads(self, payloads) -> int:
+        """Returns how many were sent; the rest were refused or hit a full send buffer."""
+        # A lone datagram goes out via plain send; sendmmsg only pays off for batches
+        if self._mmsg is not None and len(payloads) > 1:
+            try:
+                sent = self._mmsg.send(payloads)
+                refused = self._mmsg.refused
+                self.total_packets_refused += refused
+                self.total_packets_dropped_sndbuf += len(payloads) - sent - refused
+                return sent
+            except OSError as e:
+                if e.errno != errno.ENOSYS:
+                    raise
+                self._mmsg = None  # kernel without sendmmsg: fall back for good
+
+        send = self.sock.send
+        sent = 0
+        for data in payloads:
+            try:
+                try:
+                    send(data)
+                except ConnectionRefusedError:
+                    # An earlier datagram drew ICMP port-unreachable (no receiver yet);
+                    # reporting it cleared the error, so this one can still go out
+                    send(data)
+                sent += 1
+            except ConnectionRefusedError:
+                # Still refused: receiver is down, drop this packet
+                self.total_packets_refused += 1
+            except BlockingIOError:
+                self.total_packets_dropped_sndbuf += 1
+        return sent
 
     def run(self):
         print(
@@ -271,7 +481,11 @@ class UdpSimSender:
             )
 
         interval = 1.0 / float(self.hz)
+        # At high rates time.sleep's granularity (~1 ms on Windows) is too coarse;
+        # sleep short of the deadline and spin the rest
+        spin = 0.0005 if self.hz >= 200 else 0.0
         last = time.perf_counter()
+        next_t = last
 
         try:
             while True:
@@ -282,17 +496,28 @@ class UdpSimSender:
                 self.step(dt)
                 self.send_all()
 
-                # Keep a fixed-ish rate without busy waiting
-                time.sleep(interval)
+                # Deadline scheduling: ticks stay on a fixed grid regardless of step/send cost
+                next_t += interval
+                slack = next_t - time.perf_counter()
+                if slack > 0:
+                    if slack > spin:
+                        time.sleep(slack - spin)
+                    while time.perf_counter() < next_t:
+                        pass
+                elif slack < -interval:
+                    # Fell more than a tick behind (e.g. suspended); resync instead of bursting
+                    next_t = time.perf_counter()
 
         except KeyboardInterrupt:
             print("\n[sender] Stopped.")
-            if self.faults_enabled:
+            if self.faults_enabled or self.total_packets_dropped_sndbuf or self.total_packets_refused:
                 print(
                     f"[sender] Stats: attempted={self.total_packets_attempted} "
                     f"sent={self.total_packets_sent} "
                     f"jam_suppressed={self.total_packets_jammed_fault} "
-                    f"drop_suppressed={self.total_packets_dropped_fault}"
+                    f"drop_suppressed={self.total_packets_dropped_fault} "
+                    f"sndbuf_dropped={self.total_packets_dropped_sndbuf} "
+                    f"refused={self.total_packets_refused}"
                 )
         finally:
             try: